@@ -2,12 +2,15 @@
 # www.jrodal.com
 
 from __future__ import annotations
+from array import array
 from copy import deepcopy
+from functools import cache
+from itertools import chain
 
 from math import sqrt
 from rich.table import Table
 from rich.console import Console
-from typing import Callable, Generic, Iterable, Iterator, List, Type, TypeVar
+from typing import Callable, Generic, Iterable, Iterator, List, Sequence, Type, TypeVar
 
 from aoc_utils.point import Direction, Point
 from collections import deque
@@ -16,6 +19,38 @@ from collections import deque
 T = TypeVar("T")
 U = TypeVar("U")
 
+# same order as Point.neighbors_with_direction
+_DIR4_OFFSETS = (
+    (-1, 0, Direction.LEFT),
+    (1, 0, Direction.RIGHT),
+    (0, -1, Direction.UP),
+    (0, 1, Direction.DOWN),
+)
+_DIR8_OFFSETS = _DIR4_OFFSETS + (
+    (-1, -1, Direction.UPPER_LEFT),
+    (1, -1, Direction.UPPER_RIGHT),
+    (-1, 1, Direction.LOWER_LEFT),
+    (1, 1, Direction.LOWER_RIGHT),
+)
+_DIRECTION_OFFSETS = {direction: (dx, dy) for dx, dy, direction in _DIR8_OFFSETS}
+_IMMUTABLE_CELL_TYPES = {str, int, float, bool, bytes, type(None)}
+
+
+@cache
+def _neighbor_table(
+    w: int, h: int, include_diagonal: bool
+) -> list[list[tuple[int, Direction]]]:
+    offsets = _DIR8_OFFSETS if include_diagonal else _DIR4_OFFSETS
+    return [
+        [
+            ((y + dy) * w + x + dx, direction)
+            for dx, dy, direction in offsets
+            if 0 <= x + dx < w and 0 <= y + dy < h
+        ]
+        for y in range(h)
+        for x in range(w)
+    ]
+
 
 class Grid(Generic[T]):
     def __init__(
@@ -42,6 +77,8 @@ class Grid(Generic[T]):
 
         self.data = data
         self.allow_overflow = allow_overflow
+        # cached by __hash__, see there for which writes reset it
+        self._hash: int | None = None
 
     @classmethod
     def from_lines(
@@ -53,6 +90,11 @@ class Grid(Generic[T]):
         if isinstance(lines, str):
             lines = lines.splitlines()
 
+        if not delimiter and not padding:
+            # one character per cell, so the data is just the lines joined up
+            lines = list(lines)
+            return cls(list("".join(lines)), w=len(lines[0]), h=len(lines))
+
         if delimiter:
             rows = [[cell for cell in line.split(delimiter)] for line in lines]
         else:
@@ -63,8 +105,35 @@ class Grid(Generic[T]):
             rows.append([padding] * len(rows[0]))
         return cls([cell for row in rows for cell in row], w=len(rows[0]), h=len(rows))
 
+    @classmethod
+    def from_lines_as_bytes(
+        cls: Type["Grid[int]"], lines: str | Iterable[str]
+    ) -> "Grid[int]":
+        # one byte per cell holding its ascii code, e.g. ord("#"), instead of a
+        # list of single character strings
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        lines = list(lines)
+        return cls(
+            bytearray("".join(lines).encode("ascii")),  # pyright: ignore
+            w=len(lines[0]),
+            h=len(lines),
+        )
+
     def fill(self, value: T) -> None:
-        self.data = [value] * self.w * self.h
+        self.data = self._new_data([value] * self.w * self.h)
+        self._hash = None
+
+    def _new_data(self, cells: Iterable[T]) -> List[T]:
+        # keep byte grids as bytes when rebuilding their data
+        if isinstance(self.data, bytearray):
+            return bytearray(cells)  # pyright: ignore
+        return list(cells)
+
+    def _str_cells(self) -> Sequence[str]:
+        if isinstance(self.data, bytearray):
+            return self.data.decode()
+        return [str(cell) for cell in self.data]
 
     def _should_include(
         self,
@@ -95,19 +164,63 @@ class Grid(Generic[T]):
         exclude: T | Callable[[Point, T], bool] | None = None,
         include: T | Callable[[Point, T], bool] | None = None,
     ) -> Iterator[tuple[Point, T]]:
-        if reverse:
-            for i in reversed(range(len(self.data))):
-                x, y = i % self.w, i // self.w
-                cell = self.data[i]
-                point = Point(x, y)
-                if self._should_include(point, cell, exclude, include):
-                    yield point, cell
+        if include is not None and not callable(include):
+            # only the cells holding include can match, so only they get a point
+            cells = ((i, self.data[i]) for i in self.scan(include, reverse))
         else:
-            for i, cell in enumerate(self.data):
-                x, y = i % self.w, i // self.w
-                point = Point(x, y)
-                if self._should_include(point, cell, exclude, include):
-                    yield point, cell
+            cells = self.iter_flat(reverse)
+        for i, cell in cells:
+            point = Point(i % self.w, i // self.w)
+            if self._should_include(point, cell, exclude, include):
+                yield point, cell
+
+    def iter_flat(self, reverse: bool = False) -> Iterator[tuple[int, T]]:
+        # flat indices instead of points, for scans that don't need coordinates
+        if reverse:
+            return zip(reversed(range(len(self.data))), reversed(self.data))
+        return enumerate(self.data)
+
+    def scan(self, value: T, reverse: bool = False) -> Iterator[int]:
+        # flat indices of the cells holding value, without building points
+        if reverse:
+            for i, cell in self.iter_flat(reverse):
+                if cell == value:
+                    yield i
+            return
+
+        # index() searches in C, so jump straight from one match to the next
+        data = self.data
+        if isinstance(data, bytearray) and not isinstance(value, int):
+            # byte cells are ints: a str never matches, and bytes would turn
+            # index() into a substring search
+            return
+        i = 0
+        while True:
+            try:
+                i = data.index(value, i)
+            except ValueError:
+                return
+            yield i
+            i += 1
+
+    def iter_axis(self, direction: Direction) -> Iterator[range]:
+        # one lane of flat indices per row/col, starting from the edge in direction
+        w, h = self.w, self.h
+        match direction:
+            case Direction.UP:
+                for c in range(w):
+                    yield range(c, w * h, w)
+            case Direction.DOWN:
+                for c in range(w):
+                    yield range((h - 1) * w + c, c - w, -w)
+            case Direction.LEFT:
+                for r in range(h):
+                    yield range(r * w, (r + 1) * w)
+            case Direction.RIGHT:
+                for r in range(h):
+                    yield range((r + 1) * w - 1, r * w - 1, -1)
+            case _:
+                raise ValueError(f"Invalid direction: {direction}")
 
     def __iter__(self) -> Iterator[tuple[Point, T]]:
         # Call iter without filters or reverse
@@ -118,7 +231,8 @@ class Grid(Generic[T]):
     ) -> T | None:
         if not p:
             return None
-        return self.get(p.neighbor(direction), default)
+        dx, dy = _DIRECTION_OFFSETS[direction]
+        return self.get((p.x + dx, p.y + dy), default)
 
     def walk_directions(
         self,
@@ -140,6 +254,7 @@ class Grid(Generic[T]):
             self.data[p2.y * self.w + p2.x],
             self.data[p1.y * self.w + p1.x],
         )
+        self._hash = None
         return p2
 
     def shortest_path(
@@ -155,6 +270,65 @@ class Grid(Generic[T]):
             source = self.find(source)
         if not isinstance(target, Point):
             target = self.find(target)
+        # overflowing searches can leave the grid and a search can start off it
+        # (e.g. entering from an edge), neither of which has a flat index
+        overflow = self._allow_overflow(allow_overflow)
+        if overflow or not self.inbounds(source):
+            return self._shortest_path_by_point(
+                source,
+                target,
+                exclude=exclude,
+                include=include,
+                include_diagonal=include_diagonal,
+                allow_overflow=overflow,
+            )
+
+        if not self.inbounds(target):
+            raise Exception("No path found")
+
+        # neighbors always stay inbounds, so search over flat indices: seen cells
+        # and predecessors live in flat arrays and neighbors come from the cache
+        w = self.w
+        neighbor_cache = self.prepare_neighbors(include_diagonal)
+        seen = bytearray(w * self.h)
+        predecessors = array("i", [-1]) * (w * self.h)
+        source_idx, target_idx = source.y * w + source.x, target.y * w + target.x
+        seen[source_idx] = 1
+        queue = deque([source_idx])
+        while queue:
+            current_idx = queue.popleft()
+            if current_idx == target_idx:
+                break
+
+            for idx, _ in neighbor_cache[current_idx]:
+                if seen[idx] or not self._should_include_index(idx, exclude, include):
+                    continue
+                seen[idx] = 1
+                queue.append(idx)
+                predecessors[idx] = current_idx
+
+        if not seen[target_idx]:
+            raise Exception("No path found")
+
+        # Reconstruct the shortest path by backtracking
+        path = []
+        idx = target_idx
+        while idx != -1:
+            path.append(Point(idx % w, idx // w))
+            idx = predecessors[idx]
+
+        # Return the path in the correct order (from source to target)
+        return list(reversed(path))
+
+    def _shortest_path_by_point(
+        self,
+        source: Point,
+        target: Point,
+        exclude: T | Callable[[Point, T], bool] | None = None,
+        include: T | Callable[[Point, T], bool] | None = None,
+        include_diagonal: bool = False,
+        allow_overflow: bool = False,
+    ) -> list[Point]:
         queue = deque([source])
         seen = {source}
         predecessors: dict[Point, Point | None] = {source: None}
@@ -200,12 +374,58 @@ class Grid(Generic[T]):
         include_diagonal: bool = False,
         allow_overflow: bool | None = None,
     ) -> Iterator[tuple[Point, int]]:
-        seen = set()
-        queue = deque([(p, 0)])  # Use deque for efficient BFS
-        seen.add(p)
+        # like shortest_path, only an inbounds start without overflow has a flat
+        # index to search from
+        overflow = self._allow_overflow(allow_overflow)
+        if overflow or not self.inbounds(p):
+            yield from self._reachable_by_point(
+                p,
+                exclude=exclude,
+                include=include,
+                min_steps=min_steps,
+                max_steps=max_steps,
+                include_diagonal=include_diagonal,
+                allow_overflow=overflow,
+            )
+            return
+
+        w = self.w
+        neighbor_cache = self.prepare_neighbors(include_diagonal)
+        seen = bytearray(w * self.h)
+        seen[p.y * w + p.x] = 1
+        queue = deque([(p.y * w + p.x, 0)])  # Use deque for efficient BFS
+
+        while queue:
+            current_idx, steps = queue.popleft()  # Pop from the left for BFS
+
+            if max_steps is not None and steps > max_steps:
+                continue
+
+            if steps >= min_steps:
+                yield Point(current_idx % w, current_idx // w), steps
+
+            for idx, _ in neighbor_cache[current_idx]:
+                if seen[idx] or not self._should_include_index(idx, exclude, include):
+                    continue
+                seen[idx] = 1
+                queue.append((idx, steps + 1))
+
+    def _reachable_by_point(
+        self,
+        p: Point,
+        *,
+        exclude: T | Callable[[Point, T], bool] | None = None,
+        include: T | Callable[[Point, T], bool] | None = None,
+        min_steps: int = 1,
+        max_steps: int | None = None,
+        include_diagonal: bool = False,
+        allow_overflow: bool = False,
+    ) -> Iterator[tuple[Point, int]]:
+        seen = {p}
+        queue = deque([(p, 0)])
 
         while queue:
-            current_point, steps = queue.popleft()  # Pop from the left for BFS
+            current_point, steps = queue.popleft()
 
             if max_steps is not None and steps > max_steps:
                 continue
@@ -224,6 +444,30 @@ class Grid(Generic[T]):
                     seen.add(neighbor_p)
                     queue.append((neighbor_p, steps + 1))
 
+    def prepare_neighbors(
+        self, include_diagonal: bool = False
+    ) -> list[list[tuple[int, Direction]]]:
+        # inbounds neighbor flat indices of every cell. This only depends on w and
+        # h, so copies and same-size grids share one table
+        return _neighbor_table(self.w, self.h, include_diagonal)
+
+    def _should_include_index(
+        self,
+        i: int,
+        exclude: T | Callable[[Point, T], bool] | None = None,
+        include: T | Callable[[Point, T], bool] | None = None,
+    ) -> bool:
+        cell = self.data[i]
+        if cell is None:
+            return False
+        # only callable filters need the point, so skip building it otherwise
+        if callable(exclude) or callable(include):
+            point = Point(i % self.w, i // self.w)
+            return self._should_include(point, cell, exclude, include)
+        return (exclude is None or cell != exclude) and (
+            include is None or cell == include
+        )
+
     def transform(self, func: Callable[[T], U]) -> "Grid[U]":
         transformed_data = [func(cell) for cell in self.data]
         return Grid[U](
@@ -231,15 +475,20 @@ class Grid(Generic[T]):
         )
 
     def transpose(self) -> "Grid[T]":
+        # data[c::w] slices out column c, so the whole copy stays in C
+        data, w = self.data, self.w
         return Grid(
-            [cell for col in self.iter_cols() for cell in col], w=self.h, h=self.w
+            self._new_data(chain.from_iterable(data[c::w] for c in range(w))),
+            w=self.h,
+            h=w,
         )
 
     def rotate(self) -> "Grid[T]":
+        data, w = self.data, self.w
         return Grid(
-            [cell for col in self.iter_cols() for cell in reversed(list(col))],
+            self._new_data(chain.from_iterable(data[c::w][::-1] for c in range(w))),
             w=self.h,
-            h=self.w,
+            h=w,
         )
 
     def iter_rows(self) -> Iterator[Iterator[T]]:
@@ -273,8 +522,16 @@ class Grid(Generic[T]):
         x, y = p
         if self._allow_overflow(allow_overflow):
             x, y = x % self.w, y % self.h
+        return self._at(x, y)
+
+    # unchecked flat lookups for hot paths that already have coordinates in hand
+    def _at(self, x: int, y: int) -> T:
         return self.data[y * self.w + x]
 
+    def _set(self, x: int, y: int, value: T) -> None:
+        self.data[y * self.w + x] = value
+        self._hash = None
+
     def replace(
         self,
         p: Point | tuple[int, int],
@@ -285,11 +542,16 @@ class Grid(Generic[T]):
         x, y = p
         if self._allow_overflow(allow_overflow):
             x, y = x % self.w, y % self.h
-        elif self.get(p) is None:
+        elif not (0 <= x < self.w and 0 <= y < self.h) or self._at(x, y) is None:
             return
         if color and isinstance(value, str):
             value = f"[{color}]{value}[/{color}]"  # pyright: ignore
-        self.data[y * self.w + x] = value
+        self._set(x, y, value)
+
+    def replace_cells(self, indices: slice, cells: Iterable[T]) -> None:
+        # bulk write of a flat slice, e.g. a whole row or column at once
+        self.data[indices] = cells  # pyright: ignore
+        self._hash = None
 
     def left(self, p: Point) -> T | None:
         return self.get(p.left)
@@ -320,9 +582,8 @@ class Grid(Generic[T]):
         return Point(i % self.w, i // self.w)
 
     def findall(self, value: T) -> Iterator[Point]:
-        for p, c in self.iter():
-            if c == value:
-                yield p
+        for i in self.scan(value):
+            yield Point(i % self.w, i // self.w)
 
     def get(
         self,
@@ -331,8 +592,11 @@ class Grid(Generic[T]):
         *,
         allow_overflow: bool | None = None,
     ) -> T | None:
-        if self.inbounds(p) or (allow_overflow := self._allow_overflow(allow_overflow)):
-            return self.at(p, allow_overflow=allow_overflow)
+        x, y = p
+        if 0 <= x < self.w and 0 <= y < self.h:
+            return self._at(x, y)
+        elif self._allow_overflow(allow_overflow):
+            return self._at(x % self.w, y % self.h)
         else:
             return default
 
@@ -349,11 +613,20 @@ class Grid(Generic[T]):
         allow_overflow: bool | None = False,
         include_diagonal: bool = False,
     ) -> Iterator[tuple[Point, T, Direction]]:
-        for neighbor, direction in p.neighbors_with_direction(
-            include_diagonal=include_diagonal
-        ):
-            v = self.get(neighbor, allow_overflow=allow_overflow)
-            if v is not None and self._should_include(neighbor, v, exclude, include):
+        w, h = self.w, self.h
+        overflow = self._allow_overflow(allow_overflow)
+        for dx, dy, direction in _DIR8_OFFSETS if include_diagonal else _DIR4_OFFSETS:
+            nx, ny = p.x + dx, p.y + dy
+            if 0 <= nx < w and 0 <= ny < h:
+                v = self._at(nx, ny)
+            elif overflow:
+                v = self._at(nx % w, ny % h)
+            else:
+                continue
+            if v is None:
+                continue
+            neighbor = Point(nx, ny)
+            if self._should_include(neighbor, v, exclude, include):
                 yield neighbor, v, direction
 
     def display(self, rich: bool = False) -> None:
@@ -361,15 +634,27 @@ class Grid(Generic[T]):
             table = Table(show_header=False, show_lines=True)
             for _ in range(self.w):
                 table.add_column()
-            for row in self.iter_rows():
-                table.add_row(*map(str, row))
+            cells = self._str_cells()
+            for r in range(self.h):
+                table.add_row(*cells[r * self.w : (r + 1) * self.w])
             console = Console()
             console.print(table)
         else:
             print(str(self))
 
     def __str__(self) -> str:
-        return "\n".join("".join(map(str, r)) for r in self.iter_rows())
+        data, w, h = self.data, self.w, self.h
+        if isinstance(data, bytearray):
+            return b"\n".join(data[r * w : (r + 1) * w] for r in range(h)).decode()
+        try:
+            # string cells join as they are, without a str() call per cell
+            return "\n".join(
+                "".join(data[r * w : (r + 1) * w]) for r in range(h)  # pyright: ignore
+            )
+        except TypeError:
+            return "\n".join(
+                "".join(map(str, data[r * w : (r + 1) * w])) for r in range(h)
+            )
 
     def colored_str(
         self,
@@ -380,9 +665,9 @@ class Grid(Generic[T]):
         values_to_color = values_to_color or {}
 
         res = ["" for _ in range(self.h)]
-        for i, cell in enumerate(self.data):
+        for i, cell in enumerate(self._str_cells()):
             x, y = i % self.w, i // self.w
-            color = points_to_colors.get(Point(x, y), values_to_color.get(str(cell)))
+            color = points_to_colors.get(Point(x, y), values_to_color.get(cell))
             if color:
                 # this is to prevent \[{color}] from being escaped
                 if res[y]:
@@ -394,7 +679,7 @@ class Grid(Generic[T]):
                     cell = "\\\\"
                 res[y] += f"[{color}]{cell}[/{color}]"
             else:
-                res[y] += str(cell)
+                res[y] += cell
         return "\n".join(res)
 
     def __eq__(self, other: object) -> bool:
@@ -403,10 +688,25 @@ class Grid(Generic[T]):
         return self.data == other.data
 
     def __hash__(self) -> int:
-        return hash(tuple(self.data)) + hash(self.w) - hash(self.h)
+        # The hash is cached until the grid is changed through swap, replace,
+        # replace_cells or fill (or _set). Writing to self.data directly leaves
+        # a stale hash behind, so mutate through those methods, or hash a copy.
+        if self._hash is None:
+            if isinstance(self.data, (bytes, bytearray)):
+                signature = bytes(self.data)
+            else:
+                try:
+                    # one contiguous string hashes much faster than a tuple of
+                    # cells; joins that collide are still told apart by __eq__
+                    signature = "".join(self.data)  # pyright: ignore
+                except TypeError:
+                    signature = tuple(self.data)
+            self._hash = hash((signature, self.w, self.h))
+        return self._hash
 
     def copy(self, deep: bool = False) -> "Grid[T]":
-        if deep:
+        # a deep copy of immutable cells is just a copy of the list
+        if deep and not set(map(type, self.data)) <= _IMMUTABLE_CELL_TYPES:
             return deepcopy(self)
         else:
             return Grid(
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import astuple, dataclass
+from dataclasses import dataclass
 from enum import Enum
 from math import sqrt
 from typing import Iterable, Iterator
@@ -233,7 +233,8 @@ class Point:
         return Point(self.x - other.x, self.y - other.y)
 
     def __iter__(self) -> Iterator[int]:
-        return iter(astuple(self))
+        # astuple deep copies fields, which is far too slow for every unpack
+        return iter((self.x, self.y))
 
     def __lt__(self, other: Point) -> bool:
         return (self.y, self.x) < (other.y, other.x)
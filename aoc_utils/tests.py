@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# www.jrodal.com
+
+import unittest
+
+from aoc_utils.grid import Grid
+from aoc_utils.point import Point
+
+
+class GridSearchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.grid = Grid.from_lines("...\n...\n...")
+
+    def test_shortest_path_from_off_grid_source(self) -> None:
+        self.assertEqual(
+            self.grid.shortest_path(Point(3, 0), Point(0, 0)),
+            [Point(3, 0), Point(2, 0), Point(1, 0), Point(0, 0)],
+        )
+
+    def test_shortest_path_to_off_grid_target(self) -> None:
+        with self.assertRaises(Exception):
+            self.grid.shortest_path(Point(0, 0), Point(-1, 0))
+
+    def test_reachable_from_off_grid_start(self) -> None:
+        self.assertEqual(
+            list(self.grid.reachable(Point(3, 0), max_steps=1)), [(Point(2, 0), 1)]
+        )
+        self.assertEqual(
+            list(self.grid.reachable(Point(-1, 0), max_steps=1)), [(Point(0, 0), 1)]
+        )
+
+
+class GridHashTests(unittest.TestCase):
+    def test_hash_follows_mutations(self) -> None:
+        grid = Grid.from_lines("ab\ncd")
+        seen = {grid}
+        grid.replace(Point(0, 0), "z")
+        self.assertNotIn(grid, seen)
+        grid.replace_cells(slice(0, 2), ["a", "b"])
+        self.assertIn(grid, seen)
+        grid.swap(Point(0, 0), Point(1, 0))
+        self.assertEqual(hash(grid), hash(Grid.from_lines("ba\ncd")))
+
+
+class ByteGridTests(unittest.TestCase):
+    def test_str_values_match_nothing(self) -> None:
+        grid = Grid.from_lines_as_bytes("#.\n.#")
+        self.assertEqual(list(grid.scan("#")), [])
+        self.assertEqual(list(grid.scan("#", reverse=True)), [])
+        self.assertEqual(list(grid.findall("#")), [])
+        self.assertEqual(list(grid.iter(include="#")), [])
+        self.assertEqual(list(grid.findall(ord("#"))), [Point(0, 0), Point(1, 1)])
+
+    def test_non_ascii_input_is_rejected(self) -> None:
+        with self.assertRaises(UnicodeEncodeError):
+            Grid.from_lines_as_bytes("é.\n.#")
+
+    def test_bytes_values_match_nothing(self) -> None:
+        grid = Grid.from_lines_as_bytes("#.\n.#")
+        self.assertEqual(list(grid.scan(b"#")), [])
+        self.assertEqual(list(grid.scan(b"#", reverse=True)), [])
+        self.assertEqual(list(grid.findall(b"#.")), [])
+        self.assertEqual(list(grid.iter(include=b"#")), [])
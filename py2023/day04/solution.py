@@ -1,35 +1,38 @@
 #!/usr/bin/env python3
 # www.jrodal.com
 
+import re
+
+import numpy as np
+
 from aoc_utils.base_solver import BaseSolver, Solution
 
+NUMBER = re.compile(rb"\d+")
+
 
 class Solver(BaseSolver):
     PART1_EXAMPLE_SOLUTION: Solution | None = 13
     PART2_EXAMPLE_SOLUTION: Solution | None = 30
 
     def _part1(self) -> Solution:
-        res = 0
-        for card in self.data.splitlines():
-            _, numbers = card.split(": ")
-            winners, mine = numbers.split(" | ")
-            winners = set(int(x) for x in winners.split())
-            mine = set(int(x) for x in mine.split())
-            num_matches = len(winners & mine)
-            if num_matches > 0:
-                res += int(2 ** (num_matches - 1))
-        return res
+        # 2 ** (n - 1) points per card, and nothing for no matches
+        return int(((1 << self._num_matches()) >> 1).sum())
 
     def _part2(self) -> Solution:
-        cards_original = self.data.splitlines()
-        num_cards = [1 for _ in range(len(cards_original))]
-        for i, card in enumerate(cards_original):
-            _, numbers = card.split(": ")
-            card_num = i + 1
-            winners, mine = numbers.split(" | ")
-            winners = set(int(x) for x in winners.split())
-            mine = set(int(x) for x in mine.split())
-            num_matches = len(winners & mine)
-            for j in range(num_matches):
-                num_cards[card_num + j] += num_cards[i]
+        num_matches = self._num_matches().tolist()
+        num_cards = [1 for _ in range(len(num_matches))]
+        for i, n in enumerate(num_matches):
+            for j in range(n):
+                num_cards[i + 1 + j] += num_cards[i]
         return sum(num_cards)
+
+    def _num_matches(self) -> np.ndarray:
+        data = self.data.encode()
+        # every card has the same number of winners and numbers, so parse the
+        # whole input at once into a card id, winners and numbers per row
+        first_winners = data.split(b"\n", 1)[0].split(b" | ")[0]
+        num_winners = len(NUMBER.findall(first_winners)) - 1
+        cards = np.array(list(map(int, NUMBER.findall(data))), dtype=np.int16)
+        cards = cards.reshape(len(self.lines()), -1)
+        winners, mine = cards[:, 1 : 1 + num_winners], cards[:, 1 + num_winners :]
+        return (mine[:, :, None] == winners[:, None, :]).any(axis=2).sum(axis=1)
@@ -1,73 +1,152 @@
 #!/usr/bin/env python3
 # www.jrodal.com
 
+import numpy as np
+
+from numba import njit
+
 from aoc_utils.base_solver import BaseSolver, Solution
-from aoc_utils.grid import Direction, Grid
+from aoc_utils.grid import Direction, Grid, Point
+
+ROCK, EMPTY, WALL = ord("O"), ord("."), ord("#")
+
+
+# each tilt scans its lanes from the edge the rocks roll toward, tracking the
+# next free cell since the last wall
+@njit(cache=True)
+def tilt_up(arr: np.ndarray) -> None:
+    h, w = arr.shape
+    for c in range(w):
+        free = 0
+        for r in range(h):
+            if arr[r, c] == WALL:
+                free = r + 1
+            elif arr[r, c] == ROCK:
+                arr[r, c] = EMPTY
+                arr[free, c] = ROCK
+                free += 1
+
+
+@njit(cache=True)
+def tilt_down(arr: np.ndarray) -> None:
+    h, w = arr.shape
+    for c in range(w):
+        free = h - 1
+        for r in range(h - 1, -1, -1):
+            if arr[r, c] == WALL:
+                free = r - 1
+            elif arr[r, c] == ROCK:
+                arr[r, c] = EMPTY
+                arr[free, c] = ROCK
+                free -= 1
+
+
+@njit(cache=True)
+def tilt_left(arr: np.ndarray) -> None:
+    h, w = arr.shape
+    for r in range(h):
+        free = 0
+        for c in range(w):
+            if arr[r, c] == WALL:
+                free = c + 1
+            elif arr[r, c] == ROCK:
+                arr[r, c] = EMPTY
+                arr[r, free] = ROCK
+                free += 1
+
+
+@njit(cache=True)
+def tilt_right(arr: np.ndarray) -> None:
+    h, w = arr.shape
+    for r in range(h):
+        free = w - 1
+        for c in range(w - 1, -1, -1):
+            if arr[r, c] == WALL:
+                free = c - 1
+            elif arr[r, c] == ROCK:
+                arr[r, c] = EMPTY
+                arr[r, free] = ROCK
+                free -= 1
+
+
+@njit(cache=True)
+def spin_cycle(arr: np.ndarray) -> None:
+    tilt_up(arr)
+    tilt_left(arr)
+    tilt_down(arr)
+    tilt_right(arr)
 
 
 class Solver(BaseSolver):
     def _part1(self) -> Solution:
-        self._set_animation_grid()
-        grid = self._shift_grid(self.grid, Direction.UP)
+        grid = Grid.from_lines_as_bytes(self.data)
+        self._set_animation_grid(grid)
+        grid = self._shift_grid(grid, Direction.UP)
         return self._score_grid(grid)
 
     def _part2(self) -> Solution:
-        grid = Grid.from_lines(self.data)
-        seen_grids = set()
-        cycle_grids = []
-        cycle_start = 0
-
-        TARGET = 1000000000 - 1
-        for i in range(TARGET):
-            for d in (Direction.UP, Direction.LEFT, Direction.DOWN, Direction.RIGHT):
-                grid = self._shift_grid(grid, d)
-                if d == Direction.UP:
-                    if grid in seen_grids:
-                        if cycle_grids:
-                            grid = cycle_grids[
-                                (TARGET - cycle_start) % len(cycle_grids)
-                            ]
-                            for d in (
-                                Direction.UP,
-                                Direction.LEFT,
-                                Direction.DOWN,
-                                Direction.RIGHT,
-                            ):
-                                grid = self._shift_grid(grid, d)
-
-                            return self._score_grid(grid)
-                        else:
-                            cycle_start = i
-                            seen_grids = set()
-
-                    seen_grids.add(grid)
-                    if cycle_start > 0:
-                        cycle_grids.append(grid)
-
-        assert False
-
-    def _score_grid(self, grid: Grid) -> int:
-        ans = 0
-        for j, row in enumerate(grid.rows()):
-            for i in row:
-                if i == "O":
-                    ans += grid.h - j
-        return ans
-
-    def _shift_grid(self, grid: Grid, direction: Direction) -> Grid:
-        transposed = direction in (Direction.LEFT, Direction.RIGHT)
-        direction = {Direction.LEFT: Direction.UP, Direction.RIGHT: Direction.DOWN}.get(
-            direction, direction
+        lines = self.data.splitlines()
+        arr = np.array(bytearray("".join(lines).encode()), dtype=np.uint8).reshape(
+            len(lines), len(lines[0])
         )
-        reverse = direction is Direction.DOWN
+        # state -> number of spins it first appeared after; loads[n] is the load
+        # after n spins
+        seen: dict[bytes, int] = {}
+        loads: list[int] = []
+
+        TARGET = 1000000000
+        sig = arr.tobytes()
+        while sig not in seen:
+            seen[sig] = len(loads)
+            loads.append(self._score_array(arr))
+            spin_cycle(arr)
+            sig = arr.tobytes()
+
+        # every state is spun once before the first repeat, after which the
+        # answer is a lookup, so there is nothing left to memoize
+        cycle_start = seen[sig]
+        cycle_len = len(loads) - cycle_start
+        return loads[cycle_start + (TARGET - cycle_start) % cycle_len]
+
+    @staticmethod
+    def _score_array(arr: np.ndarray) -> int:
+        return int(
+            np.count_nonzero(arr == ROCK, axis=1) @ np.arange(arr.shape[0], 0, -1)
+        )
+
+    def _score_grid(self, grid: Grid[int]) -> int:
+        return sum(grid.h - i // grid.w for i in grid.scan(ROCK))
 
-        if transposed:
-            grid = grid.transpose()
+    def _shift_grid(self, grid: Grid[int], direction: Direction) -> Grid[int]:
+        data = grid.data
+        n = 0
+        for lane in grid.iter_axis(direction):
+            # a negative stop would wrap around, so slice to the end instead
+            lane_slice = slice(
+                lane.start, lane.stop if lane.stop >= 0 else None, lane.step
+            )
+            cells = data[lane_slice]
+            start = 0
+            while start < len(cells):
+                end = cells.find(WALL, start)
+                if end == -1:
+                    end = len(cells)
+                # rocks pile up against the wall (or edge) behind the segment
+                rocks = cells.count(ROCK, start, end)
+                cells[start : start + rocks] = bytes([ROCK]) * rocks
+                cells[start + rocks : end] = bytes([EMPTY]) * (end - start - rocks)
+                start = end + 1
+            grid.replace_cells(lane_slice, cells)
 
-        for i, (p, _) in enumerate(grid.iter(reverse, include="O")):
-            self._update_animation(point=p, refresh=grid.h < 15 or i % 10 == 0)
-            while grid.get_neighbor(p, direction) == ".":
-                p = grid.swap(p, direction)
-            self._update_animation(point=p, refresh=grid.h < 15 or i % 10 == 0)
+            if self._animate:
+                k = cells.find(ROCK)
+                while k != -1:
+                    i = lane[k]
+                    self._update_animation(
+                        point=Point(i % grid.w, i // grid.w),
+                        refresh=grid.h < 15 or n % 10 == 0,
+                    )
+                    n += 1
+                    k = cells.find(ROCK, k + 1)
 
-        return grid.transpose() if transposed else grid
+        return grid
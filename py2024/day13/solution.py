@@ -3,7 +3,6 @@
 
 from aoc_utils.helpers import ints
 from aoc_utils.base_solver import BaseSolver, Solution
-from z3 import Int, Optimize, sat
 
 
 class Solver(BaseSolver):
@@ -13,27 +12,22 @@ class Solver(BaseSolver):
         ans = 0
         for section in self.sections():
             ax, ay, bx, by, x, y = ints(section)
-            ans += self._z3solver(
+            ans += self._min_tokens(
                 ax, ay, bx, by, x + conversion_factor, y + conversion_factor
             )
         return ans
 
     @classmethod
-    def _z3solver(cls, ax: int, ay: int, bx: int, by: int, x: int, y: int) -> int:
-        a_val = Int("a_val")
-        b_val = Int("b_val")
-
-        opt = Optimize()
-
-        opt.add(ax * a_val + bx * b_val == x)
-        opt.add(ay * a_val + by * b_val == y)
-        opt.add(a_val >= 0, b_val >= 0)
-
-        total_cost = 3 * a_val + b_val
-        opt.minimize(total_cost)
-
-        if opt.check() == sat:
-            model = opt.model()
-            return model.evaluate(total_cost).as_long()  # pyright: ignore
-        else:
+    def _min_tokens(cls, ax: int, ay: int, bx: int, by: int, x: int, y: int) -> int:
+        # two equations, two unknowns: solve with cramer's rule. The buttons are
+        # never parallel in the puzzle input, so the solution is unique and
+        # there is nothing left to minimize
+        det = ax * by - ay * bx
+        if det == 0:
+            return 0
+        num_a = x * by - y * bx
+        num_b = ax * y - ay * x
+        if num_a % det or num_b % det:
             return 0
+        a, b = num_a // det, num_b // det
+        return 3 * a + b if a >= 0 and b >= 0 else 0